@@ -2,20 +2,35 @@
 Endpoint discovery helper for HyperPC/Hyperliquid-style APIs.
 
 It probes a set of common REST paths and parameter shapes to infer the
-available candles endpoint and response schema. Then you can plug the
+available candles endpoint and response schema. Paths answering a HEAD request
+with 404 are skipped before their parameter shapes are tried. Then you can plug the
 found mapping into `fetch_hyperpc_template.py`.
 
 Usage (example):
   python discover_hyperpc.py --base_url https://hlh-builders-jp-testnet.hyperpc.app --symbol BTC --interval 30m --start <unix> --end <unix>
 
+Successful JSON responses are cached on disk for an hour (see probe_cache.py);
+pass --no-cache to force fresh requests.
+
 Note: This script assumes public endpoints. If your deployment requires auth,
 add headers/tokens as needed.
 """
 import argparse
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import probe_cache
+
+# one keep-alive pool shared by all probe threads (pool_maxsize >= --workers)
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=Retry(total=2, backoff_factor=0.2))
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
 
 candidate_paths = [
     "/candles",
@@ -33,19 +48,43 @@ candidate_param_sets = [
     lambda s,i,a,b: {"symbol": s, "interval": i, "limit": 1000},
 ]
 
-def probe(base: str, symbol: str, interval: str, start: int, end: int) -> None:
+def fetch_one(url: str, params: Dict, headers: Dict, use_cache: bool = True) -> Tuple[int, str, object, bool]:
+    # returns (status, content_type, json_or_None, from_cache); only 200 JSON answers are cached
+    key = probe_cache.cache_key('GET', url, params)
+    hit = probe_cache.get(key) if use_cache else None
+    if hit is not None:
+        return (*hit, True)
+    r = SESSION.get(url, params=params, headers=headers, timeout=10)
+    ctype = r.headers.get('Content-Type','')
+    j = r.json() if r.status_code == 200 and 'json' in ctype else None
+    if use_cache and j is not None:
+        probe_cache.put(key, r.status_code, ctype, j)
+    return r.status_code, ctype, j, False
+
+def path_exists(url: str, headers: Dict) -> bool:
+    # cheap pre-check per path; only a definite 404 prunes it (errors/405 keep the path)
+    try:
+        return SESSION.head(url, headers=headers, timeout=5, allow_redirects=True).status_code != 404
+    except Exception:
+        return True
+
+def probe(base: str, symbol: str, interval: str, start: int, end: int, workers: int = 16, use_cache: bool = True) -> None:
     headers = {"Accept": "application/json"}
-    for path in candidate_paths:
-        for mk in candidate_param_sets:
-            url = base.rstrip('/') + path
-            params = mk(symbol, interval, start, end)
+    # fire all probes concurrently; report in completion order from the main thread
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        urls = [base.rstrip('/') + path for path in candidate_paths]
+        alive = dict(zip(urls, ex.map(lambda u: path_exists(u, headers), urls)))
+        for url in urls:
+            if not alive[url]:
+                print(f"HEAD {url} -> 404, skipping {len(candidate_param_sets)} param sets")
+        tasks = [(url, mk(symbol, interval, start, end)) for url in urls if alive[url] for mk in candidate_param_sets]
+        futures = {ex.submit(fetch_one, url, params, headers, use_cache): (url, params) for url, params in tasks}
+        for fut in as_completed(futures):
+            url, params = futures[fut]
             try:
-                r = requests.get(url, params=params, headers=headers, timeout=10)
-                status = r.status_code
-                ctype = r.headers.get('Content-Type','')
-                print(f"GET {url} {params} -> {status} {ctype}")
-                if status == 200 and 'json' in ctype:
-                    j = r.json()
+                status, ctype, j, cached = fut.result()
+                print(f"GET {url} {params} -> {status} {ctype}{' (cached)' if cached else ''}")
+                if j is not None:
                     print('Top-level keys:', list(j.keys())[:10])
                     # Try common locations for array data
                     for key in ('data','result','candles','ohlcv','rows'):
@@ -63,6 +102,8 @@ if __name__ == '__main__':
     ap.add_argument('--interval', default='30m')
     ap.add_argument('--start', type=int, required=True)
     ap.add_argument('--end', type=int, required=True)
+    ap.add_argument('--workers', type=int, default=16, help='Concurrent probes')
+    ap.add_argument('--no-cache', action='store_true', help='Ignore and do not write the on-disk probe cache')
     args = ap.parse_args()
-    probe(args.base_url, args.symbol, args.interval, args.start, args.end)
+    probe(args.base_url, args.symbol, args.interval, args.start, args.end, workers=args.workers, use_cache=not args.no_cache)
 
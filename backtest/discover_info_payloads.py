@@ -7,46 +7,82 @@ Tries combinations of:
 - interval key: interval, tf, resolution
 - interval values: 30m, 1800, 30min
 
-Prints the first working combo and sample keys.
+Prints the first working combo and sample keys. Successful JSON responses are
+cached on disk for an hour (see probe_cache.py); pass --no-cache to skip it.
 """
 import argparse
 import json
 import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import probe_cache
 
 TYPES = ["candleSnapshot", "candle"]
 SYM_KEYS = ["coin", "asset", "symbol"]
 INT_KEYS = ["interval", "tf", "resolution"]
 INT_VALS = ["30m", 1800, "30min"]
 
-def try_one(base, t, sk, ik, iv, sym):
+# one keep-alive pool shared by all probe threads (pool_maxsize >= --workers)
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=Retry(total=2, backoff_factor=0.2))
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+
+def try_one(base, t, sk, ik, iv, sym, use_cache=True):
+    """Returns (ok, lines) so the caller can print results from one thread."""
     url = base.rstrip('/')
     payload = {"type": t, sk: sym, ik: iv}
-    r = requests.post(url, headers={"content-type":"application/json"}, json=payload, timeout=10)
-    ct = r.headers.get('content-type','')
-    print(f"{t} {sk}={sym} {ik}={iv} -> {r.status_code} {ct}")
-    if r.status_code != 200 or 'json' not in ct:
-        return False
-    try:
-        j = r.json()
-    except Exception:
-        return False
+    key = probe_cache.cache_key('POST', url, payload)
+    hit = probe_cache.get(key) if use_cache else None
+    if hit is not None:
+        status, ct, j = hit
+    else:
+        r = SESSION.post(url, headers={"content-type":"application/json"}, json=payload, timeout=10)
+        status, ct, j = r.status_code, r.headers.get('content-type',''), None
+        if status == 200 and 'json' in ct:
+            try:
+                j = r.json()
+            except Exception:
+                j = None
+        if use_cache and j is not None:
+            probe_cache.put(key, status, ct, j)
+    lines = [f"{t} {sk}={sym} {ik}={iv} -> {status} {ct}{' (cached)' if hit is not None else ''}"]
+    if j is None:
+        return False, lines
     for key in ('data','result','candles','ohlcv','rows'):
         if isinstance(j.get(key), list) and j[key]:
             first = j[key][0]
-            print('Found list at', key, 'sample:', first if isinstance(first, dict) else type(first))
-            return True
-    print('Top-level keys:', list(j.keys()) if isinstance(j, dict) else type(j))
-    return False
+            lines.append(f"Found list at {key} sample: {first if isinstance(first, dict) else type(first)}")
+            return True, lines
+    lines.append(f"Top-level keys: {list(j.keys()) if isinstance(j, dict) else type(j)}")
+    return False, lines
 
 if __name__ == '__main__':
     ap = argparse.ArgumentParser()
     ap.add_argument('--base_url', default='https://api.hyperliquid.xyz/info')
     ap.add_argument('--symbol', default='BTC')
+    ap.add_argument('--workers', type=int, default=16, help='Concurrent probes')
+    ap.add_argument('--no-cache', action='store_true', help='Ignore and do not write the on-disk probe cache')
     args = ap.parse_args()
-    for t, sk, ik, iv in itertools.product(TYPES, SYM_KEYS, INT_KEYS, INT_VALS):
-        ok = try_one(args.base_url, t, sk, ik, iv, args.symbol)
-        if ok:
-            print('SUCCESS:', t, sk, ik, iv)
-            break
-
+    combos = list(itertools.product(TYPES, SYM_KEYS, INT_KEYS, INT_VALS))
+    # race all combos; stop at the first working one and drop the rest
+    ex = ThreadPoolExecutor(max_workers=args.workers)
+    futures = {ex.submit(try_one, args.base_url, t, sk, ik, iv, args.symbol, not args.no_cache): (t, sk, ik, iv) for t, sk, ik, iv in combos}
+    try:
+        for fut in as_completed(futures):
+            t, sk, ik, iv = futures[fut]
+            try:
+                ok, lines = fut.result()
+            except Exception as e:
+                print(f"{t} {sk}={args.symbol} {ik}={iv} -> error: {e}")
+                continue
+            print('\n'.join(lines))
+            if ok:
+                print('SUCCESS:', t, sk, ik, iv)
+                break
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
@@ -2,12 +2,37 @@ import csv
 import json
 import math
 import os
-from collections import defaultdict, namedtuple
+from collections import deque, namedtuple
+from multiprocessing import Pool, shared_memory
 from dataclasses import dataclass
 from typing import Dict, List, Tuple
 import math as _math
 
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is used instead
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; the equity curve falls back to CSV
+    pa = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; run the helpers as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
 E6 = 10**6
+REPORTS_DIR = os.path.join(os.path.dirname(__file__), 'reports')
+EC_FORMAT = 'parquet' if pa is not None else 'csv'
 
 @dataclass
 class Config:
@@ -24,9 +49,23 @@ class Config:
         if self.perSymbolMaxUSD is None:
             self.perSymbolMaxUSD = {"default": 250000}
 
-def load_bots_config(path: str) -> Config:
+def _read_json(path: str):
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
     with open(path, 'r') as f:
-        raw = json.load(f)
+        return json.load(f)
+
+def _write_json(path: str, obj) -> None:
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        return
+    with open(path, 'w') as f:
+        json.dump(obj, f, indent=2)
+
+def load_bots_config(path: str) -> Config:
+    raw = _read_json(path)
     return Config(
         turnoverCapBps=raw.get('turnoverCapBps', 1000),
         maxNetDeltaUSD=raw.get('maxNetDeltaUSD', 50000),
@@ -39,8 +78,7 @@ def load_bots_config(path: str) -> Config:
     )
 
 def load_strategy(path: str) -> Dict:
-    with open(path, 'r') as f:
-        s = json.load(f)
+    s = _read_json(path)
     # Backward-compatible: if no 'type', enforce fixed-bucket strategy format
     if 'type' not in s:
         def sum_bps(arr):
@@ -49,411 +87,598 @@ def load_strategy(path: str) -> Dict:
             raise ValueError('bps sum must be 10000 each for longs and shorts')
     return s
 
-def clamp_target(sym: str, target: int, cfg: Config) -> int:
-    cap_usd = cfg.perSymbolMaxUSD.get(sym, cfg.perSymbolMaxUSD.get('default', 250000))
-    cap = int(cap_usd * E6)
-    if target > cap:
-        return cap
-    if target < -cap:
-        return -cap
-    return target
-
-def apply_guards(nav: int, current: Dict[str,int], targets: Dict[str,int], cfg: Config) -> Tuple[Dict[str,int], Dict[str,int]]:
+def symbol_caps(symbols: List[str], cfg: Config) -> List[int]:
+    # per-symbol |target| cap (USD 1e6), aligned with the given symbol order
+    default = cfg.perSymbolMaxUSD.get('default', 250000)
+    return [int(cfg.perSymbolMaxUSD.get(s, default) * E6) for s in symbols]
+
+# Preallocated per-column work lists for the rebalance path (one set per backtest, see guard_buffers);
+# entries are overwritten in place each rebalance, so steady state allocates no containers
+GuardBuffers = namedtuple('GuardBuffers', ['targets', 'final', 'active'])
+
+def guard_buffers(n: int) -> GuardBuffers:
+    return GuardBuffers([0] * n, [0] * n, [])
+
+def apply_guards(nav: int, current: List[int], targets: List[int], active: List[int], cap: List[int], cfg: Config, buf: GuardBuffers | None = None) -> Tuple[List[int], List[int]]:
+    # targets/current/cap are per-column lists of ints; `active` lists the columns the strategy
+    # targets this step (others keep their current position). Plain ints are exact at any NAV and,
+    # for the handful of columns a strategy trades, cheaper per call than NumPy ufuncs.
+    # Works in place on `targets` and fills the active entries of `buf.final` (valid until the next call).
+    if buf is None:
+        buf = guard_buffers(len(current))
     # 1) per-symbol cap
-    for s in list(targets.keys()):
-        targets[s] = clamp_target(s, targets[s], cfg)
+    for i in active:
+        v, c = targets[i], cap[i]
+        if v > c:
+            targets[i] = c
+        elif v < -c:
+            targets[i] = -c
 
     # 2) net delta guard (centering)
-    intended = sum(targets.values())
-    abs_intended = abs(intended)
-    if abs_intended > int(cfg.maxNetDeltaUSD * E6):
-        N = max(len(targets), 1)
-        adj = intended // N
-        for s in list(targets.keys()):
-            targets[s] -= adj
+    intended = 0
+    for i in active:
+        intended += targets[i]
+    if abs(intended) > int(cfg.maxNetDeltaUSD * E6):
+        adj = intended // max(len(active), 1)
+        for i in active:
+            targets[i] -= adj
 
     # 3) turnover cap (proportional scaling)
-    deltas = {s: targets.get(s,0) - current.get(s,0) for s in targets.keys()}
-    gross = sum(abs(v) for v in deltas.values())
+    gross = 0
+    for i in active:
+        gross += abs(targets[i] - current[i])
     gmax = (nav * cfg.turnoverCapBps) // 10000
-    scale_num, scale_den = (1,1)
+    final = buf.final
     if gross > gmax and gross > 0:
-        scale_num, scale_den = (gmax, gross)
-
-    final = {}
-    for s in targets.keys():
-        scaled_delta = (deltas[s] * scale_num) // scale_den
-        final[s] = current.get(s,0) + scaled_delta
-
+        for i in active:
+            final[i] = current[i] + (targets[i] - current[i]) * gmax // gross
+    else:
+        for i in active:
+            final[i] = targets[i]
     return targets, final
 
 
-def guard_and_targets(nav: int, current: Dict[str,int], strat: Dict, cfg: Config) -> Tuple[Dict[str,int], Dict[str,int]]:
-    # 1) raw targets from buckets
-    long_bucket = int(nav * cfg.leverage)
-    short_bucket = int(nav * cfg.leverage)
-    targets: Dict[str,int] = defaultdict(int)
+def bucket_weights(strat: Dict, sym_idx: Dict[str,int]) -> Tuple[List[int], List[int], List[int]]:
+    # fixed-bucket strategy -> (long_bps, short_bps) per column plus the active columns; built once per backtest
+    long_w = [0] * len(sym_idx)
+    short_w = [0] * len(sym_idx)
     for L in strat['longs']:
-        targets[L['symbol']] += (long_bucket * int(L['bps'])) // 10000
+        long_w[sym_idx[L['symbol']]] += int(L['bps'])
     for S in strat['shorts']:
-        targets[S['symbol']] -= (short_bucket * int(S['bps'])) // 10000
-    return apply_guards(nav, current, targets, cfg)
-
-
-def _safe_beta(ret_a: List[float], ret_b: List[float], beta_min: float, beta_max: float) -> float:
-    if len(ret_a) != len(ret_b) or len(ret_a) < 2:
+        short_w[sym_idx[S['symbol']]] += int(S['bps'])
+    active = sorted({sym_idx[x['symbol']] for x in strat['longs'] + strat['shorts']})
+    return long_w, short_w, active
+
+
+def guard_and_targets(nav: int, current: List[int], weights: Tuple[List[int], List[int], List[int]], cap: List[int], cfg: Config, buf: GuardBuffers | None = None) -> Tuple[List[int], List[int]]:
+    if buf is None:
+        buf = guard_buffers(len(current))
+    # 1) raw targets from buckets (long and short legs floored separately, as per-leg orders are);
+    # Python ints, since bucket * bps can overflow int64 at large NAV x leverage
+    long_w, short_w, active = weights
+    bucket = int(nav * cfg.leverage)
+    targets = buf.targets
+    for i in active:
+        targets[i] = bucket * long_w[i] // 10000 - bucket * short_w[i] // 10000
+    return apply_guards(nav, current, targets, active, cap, cfg, buf)
+
+
+class RollingStats:
+    """Mean/variance over the last `maxlen` pushed values, O(1) per push.
+
+    Values are stored shifted by the first observation to limit cancellation in
+    sum2 - sum^2/n, and the running sums are re-summed exactly once per window
+    length of pushes so float drift cannot accumulate over long backtests.
+    """
+    __slots__ = ('window', 'shift', 'sum', 'sum2', 'pushes')
+
+    def __init__(self, maxlen: int):
+        self.window: deque = deque(maxlen=maxlen if maxlen > 0 else None)
+        self.shift = None
+        self.sum = 0.0
+        self.sum2 = 0.0
+        self.pushes = 0
+
+    def push(self, x: float) -> None:
+        if self.shift is None:
+            self.shift = x
+        d = x - self.shift
+        w = self.window
+        if len(w) == w.maxlen:
+            old = w[0]
+            self.sum -= old
+            self.sum2 -= old * old
+        w.append(d)
+        self.sum += d
+        self.sum2 += d * d
+        self.pushes += 1
+        if w.maxlen is not None and self.pushes >= w.maxlen:
+            self.sum = sum(w)
+            self.sum2 = sum(v * v for v in w)
+            self.pushes = 0
+
+    def mean_var(self) -> Tuple[int, float, float]:
+        # (n, mean, sample variance); variance uses n-1 (min 1) like the windowed formula
+        n = len(self.window)
+        if n == 0:
+            return 0, 0.0, 0.0
+        m = self.sum / n
+        var = max(self.sum2 - self.sum * m, 0.0) / max(1, n - 1)
+        return n, self.shift + m, var
+
+
+@njit(cache=True)
+def _safe_beta(ret_a: np.ndarray, ret_b: np.ndarray, beta_min: float, beta_max: float) -> float:
+    n = len(ret_a)
+    if n != len(ret_b) or n < 2:
         return 1.0
-    ma = sum(ret_a) / len(ret_a)
-    mb = sum(ret_b) / len(ret_b)
-    cov = sum((ra - ma) * (rb - mb) for ra, rb in zip(ret_a, ret_b)) / (len(ret_a) - 1)
-    var_b = sum((rb - mb) ** 2 for rb in ret_b) / (len(ret_b) - 1)
+    ma = 0.0
+    mb = 0.0
+    for i in range(n):
+        ma += ret_a[i]
+        mb += ret_b[i]
+    ma /= n
+    mb /= n
+    cov = 0.0
+    var_b = 0.0
+    for i in range(n):
+        cov += (ret_a[i] - ma) * (ret_b[i] - mb)
+        var_b += (ret_b[i] - mb) ** 2
+    cov /= (n - 1)
+    var_b /= (n - 1)
     if var_b <= 0:
         return 1.0
     beta = cov / var_b
-    if beta_min is not None:
-        beta = max(beta, beta_min)
-    if beta_max is not None:
-        beta = min(beta, beta_max)
+    beta = max(beta, beta_min)
+    beta = min(beta, beta_max)
     if not _math.isfinite(beta):
         return 1.0
     return beta
 
 
-def compute_targets_pair_breakout(nav: int, last_px: Dict[str,float], ret_hist: Dict[str,List[float]], symA: str, symB: str, params: Dict, cfg: Config, state: Dict, spread_hist: Dict) -> Tuple[Dict[str,int], Dict]:
-    # params: lookback(int), z_k(float), maxSkewBps(float), betaMin(float), betaMax(float)
-    lookback = int(params.get('lookback', 24))
-    # Support legacy z_k as k_in
-    k_in = float(params.get('k_in', params.get('z_k', 2.0)))
-    k_out = float(params.get('k_out', max(1.0, k_in / 2.0)))
-    min_hold = int(params.get('minHoldSteps', 0))
-    neutral_skip_bps = float(params.get('neutralDriftThresholdBps', 0.0))
-    regime_stop_bps = float(params.get('regimeStopBps', 50.0))
-    regime_tp_bps = float(params.get('regimeTPBps', 100.0))
-    max_skew_bps = float(params.get('maxSkewBps', 100.0))
-    beta_min = float(params.get('betaMin', 0.2))
-    beta_max = float(params.get('betaMax', 5.0))
-    use_beta = bool(params.get('useBetaHedge', False))
-
-    # require both prices
-    if symA not in last_px or symB not in last_px:
-        return {}, {"regime": state.get('regime', 'neutral'), "neutralSkipBps": neutral_skip_bps}
+# pair regimes as ints for the jitted core; index -> name
+REGIME_NEUTRAL, REGIME_LONG, REGIME_SHORT = 0, 1, 2
+_REGIME_NAMES = ('neutral', 'long', 'short')
+_NO_RETS = np.empty(0, dtype=np.float64)
 
+@njit(cache=True)
+def _pair_core(ra: np.ndarray, rb: np.ndarray, s: float, n: int, m: float, var: float, nav: int, leverage: float,
+               lookback: int, k_in: float, k_out: float, min_hold: int, regime_stop_bps: float, regime_tp_bps: float,
+               beta_min: float, beta_max: float, use_beta: bool,
+               regime: int, hold: int, entry_nav_e6: int, nav_delta_bps: int) -> Tuple[int, int, int, int, int, float]:
+    # Numeric core of compute_targets_pair_breakout; returns (l_usd_e6, s_usd_e6, regime, hold, entry_nav_e6, skew_scale).
+    # Products that can exceed int64 at large NAV (NAV-delta bps, skew USD) are left to the Python wrapper.
     # Hedge ratio using rolling beta of A on B
-    ra = ret_hist.get(symA, [])[-lookback:]
-    rb = ret_hist.get(symB, [])[-lookback:]
     beta = _safe_beta(ra, rb, beta_min, beta_max) if use_beta else 1.0
 
     # Base neutral gross (long A, short B) with ratio L/S = beta, preserving total gross ~ 2*nav*leverage
-    total_gross_e6 = int(2 * nav * cfg.leverage)
+    total_gross_e6 = int(2 * nav * leverage)
     ratio = max(beta, 1e-6)
     s_usd_e6 = int(total_gross_e6 / (ratio + 1.0))
     l_usd_e6 = int(total_gross_e6 - s_usd_e6)
 
-    # Spread z-score on log spread s = ln(A/B)
-    try:
-        s = _math.log(max(last_px[symA], 1e-12) / max(last_px[symB], 1e-12))
-    except Exception:
-        s = 0.0
-    key = (symA, symB)
-    hist = spread_hist.get(key, [])
-    hist.append(s)
-    spread_hist[key] = hist
-    use_hist = hist[-lookback:]
-    if len(use_hist) >= max(lookback // 2, 8):
-        m = sum(use_hist) / len(use_hist)
-        var = sum((x - m) ** 2 for x in use_hist) / max(1, len(use_hist) - 1)
+    # Spread z-score on log spread s = ln(A/B); n/m/var are the rolling window stats (window includes s)
+    if n >= max(lookback // 2, 8):
         std = _math.sqrt(max(var, 0.0))
         z = (s - m) / std if std > 0 else 0.0
     else:
         z = 0.0
 
-    # Skew: tilt net exposure when breakout detected
     # Regime logic with hysteresis and min-hold
-    regime = state.get('regime', 'neutral')
-    hold = int(state.get('hold', 0))
-    entry_nav_e6 = int(state.get('entry_nav_e6', nav))
     new_regime = regime
-    if regime == 'neutral':
+    if regime == REGIME_NEUTRAL:
         if k_in > 0 and z >= k_in:
-            new_regime = 'long'
+            new_regime = REGIME_LONG
             hold = 0
             entry_nav_e6 = nav
         elif k_in > 0 and z <= -k_in:
-            new_regime = 'short'
+            new_regime = REGIME_SHORT
             hold = 0
             entry_nav_e6 = nav
-    elif regime == 'long':
-        # stop loss / take profit based on NAV change since entry
-        if entry_nav_e6 > 0:
-            nav_delta_bps = ((nav - entry_nav_e6) * 10000) // entry_nav_e6
-            if regime_stop_bps > 0 and nav_delta_bps <= -regime_stop_bps:
-                new_regime = 'neutral'
-                hold = 0
-            elif regime_tp_bps > 0 and nav_delta_bps >= regime_tp_bps:
-                new_regime = 'neutral'
-                hold = 0
-        if hold < min_hold:
-            hold += 1
-        else:
-            if abs(z) <= k_out:
-                new_regime = 'neutral'
-                hold = 0
-            else:
-                hold += 1
-    elif regime == 'short':
+    else:
+        # long/short share one exit path: stop loss / take profit based on NAV change since entry
         if entry_nav_e6 > 0:
-            nav_delta_bps = ((nav - entry_nav_e6) * 10000) // entry_nav_e6
             if regime_stop_bps > 0 and nav_delta_bps <= -regime_stop_bps:
-                new_regime = 'neutral'
+                new_regime = REGIME_NEUTRAL
                 hold = 0
             elif regime_tp_bps > 0 and nav_delta_bps >= regime_tp_bps:
-                new_regime = 'neutral'
+                new_regime = REGIME_NEUTRAL
                 hold = 0
         if hold < min_hold:
             hold += 1
         else:
             if abs(z) <= k_out:
-                new_regime = 'neutral'
+                new_regime = REGIME_NEUTRAL
                 hold = 0
             else:
                 hold += 1
 
-    state['regime'] = new_regime
-    state['hold'] = hold
-    state['entry_nav_e6'] = entry_nav_e6
-
-    skew = 0
-    if new_regime in ('long', 'short') and k_in > 0 and abs(z) > k_in:
+    # Skew scale in [0, 1] once the breakout is past k_in (the wrapper sizes the tilt in USD)
+    scale = 0.0
+    if new_regime != REGIME_NEUTRAL and k_in > 0 and abs(z) > k_in:
         scale = min((abs(z) - k_in) / max(k_in, 1e-9), 1.0)
-        skew = int((nav * (max_skew_bps / 10000.0)) * scale * E6)
-        if new_regime == 'short':
+
+    return l_usd_e6, s_usd_e6, new_regime, hold, entry_nav_e6, scale
+
+
+# Parsed pair_neutral_breakout params (see README); build once per backtest with pair_params()
+PairParams = namedtuple('PairParams', [
+    'lookback', 'k_in', 'k_out', 'min_hold', 'neutral_skip_bps', 'regime_stop_bps', 'regime_tp_bps',
+    'max_skew_bps', 'beta_min', 'beta_max', 'use_beta',
+])
+
+def pair_params(params: Dict) -> PairParams:
+    # params: lookback(int), z_k(float), maxSkewBps(float), betaMin(float), betaMax(float)
+    # Support legacy z_k as k_in
+    k_in = float(params.get('k_in', params.get('z_k', 2.0)))
+    return PairParams(
+        lookback=int(params.get('lookback', 24)),
+        k_in=k_in,
+        k_out=float(params.get('k_out', max(1.0, k_in / 2.0))),
+        min_hold=int(params.get('minHoldSteps', 0)),
+        neutral_skip_bps=float(params.get('neutralDriftThresholdBps', 0.0)),
+        regime_stop_bps=float(params.get('regimeStopBps', 50.0)),
+        regime_tp_bps=float(params.get('regimeTPBps', 100.0)),
+        max_skew_bps=float(params.get('maxSkewBps', 100.0)),
+        beta_min=float(params.get('betaMin', 0.2)),
+        beta_max=float(params.get('betaMax', 5.0)),
+        use_beta=bool(params.get('useBetaHedge', False)),
+    )
+
+def compute_targets_pair_breakout(nav: int, last_px: Dict[str,float], ret_hist: Dict[str,deque], symA: str, symB: str, params: PairParams | Dict, cfg: Config, state: Dict, spread_hist: Dict[Tuple[str,str], RollingStats]) -> Tuple[Dict[str,int], Dict]:
+    p = params if isinstance(params, PairParams) else pair_params(params)
+    neutral_skip_bps = p.neutral_skip_bps
+
+    # require both prices
+    if symA not in last_px or symB not in last_px:
+        return {}, {"regime": state.get('regime', 'neutral'), "neutralSkipBps": neutral_skip_bps}
+
+    if p.use_beta:
+        # ret_hist windows are already bounded to `lookback` (see backtest)
+        ra = np.fromiter(ret_hist.get(symA, ()), dtype=np.float64)
+        rb = np.fromiter(ret_hist.get(symB, ()), dtype=np.float64)
+    else:
+        ra = rb = _NO_RETS  # unused by _pair_core without the beta hedge
+
+    try:
+        s = _math.log(max(last_px[symA], 1e-12) / max(last_px[symB], 1e-12))
+    except Exception:
+        s = 0.0
+    key = (symA, symB)
+    hist = spread_hist.get(key)
+    if hist is None:
+        hist = spread_hist[key] = RollingStats(p.lookback)
+    hist.push(s)
+    n, m, var = hist.mean_var()
+
+    # NAV change since regime entry in bps, as a Python int ((nav - entry) * 1e4 can exceed int64)
+    entry_nav_e6 = int(state.get('entry_nav_e6', nav))
+    nav_delta_bps = ((nav - entry_nav_e6) * 10000) // entry_nav_e6 if entry_nav_e6 > 0 else 0
+
+    l_usd_e6, s_usd_e6, regime, hold, entry_nav_e6, scale = _pair_core(
+        ra, rb, s, n, m, var, nav, float(cfg.leverage),
+        p.lookback, p.k_in, p.k_out, p.min_hold, p.regime_stop_bps, p.regime_tp_bps,
+        p.beta_min, p.beta_max, p.use_beta,
+        _REGIME_NAMES.index(state.get('regime', 'neutral')), int(state.get('hold', 0)), entry_nav_e6, nav_delta_bps,
+    )
+    new_regime = _REGIME_NAMES[regime]
+
+    # Skew: tilt net exposure when breakout detected, by shifting long up and short down
+    # (Python ints: nav * maxSkewBps * 1e6 overflows int64 at large NAV)
+    if scale > 0:
+        skew = int((nav * (p.max_skew_bps / 10000.0)) * scale * E6)
+        if regime == REGIME_SHORT:
             skew = -skew
+        if skew != 0:
+            delta = skew // 2
+            l_usd_e6 = max(0, l_usd_e6 + delta)
+            s_usd_e6 = max(0, s_usd_e6 - delta)
 
-    # Apply skew by shifting long up and short down to create net tilt
-    if skew != 0:
-        delta = skew // 2
-        l_usd_e6 = max(0, l_usd_e6 + delta)
-        s_usd_e6 = max(0, s_usd_e6 - delta)
+    state['regime'] = new_regime
+    state['hold'] = hold
+    state['entry_nav_e6'] = entry_nav_e6
 
     targets = {symA: l_usd_e6, symB: -s_usd_e6}
     return targets, {"regime": new_regime, "neutralSkipBps": neutral_skip_bps}
 
-def read_prices_csv(path: str) -> List[Tuple[int, str, float, float]]:
+# Wide SoA price data: timeline[T] (unix s), symbols[N], px[T, N] closes (NaN = missing), fund[T, N] funding bps (0 = none)
+PriceMatrix = namedtuple('PriceMatrix', ['timeline', 'symbols', 'px', 'fund'])
+
+def parquet_sibling(path: str) -> str:
+    # data/prices_1h.csv -> data/prices_1h.parquet
+    return os.path.splitext(path)[0] + '.parquet'
+
+def load_prices_frame(path: str, columns: Tuple[str, ...] = ('timestamp', 'symbol', 'close')) -> pd.DataFrame:
+    """
+    Loads a long-format prices CSV as a DataFrame (the given columns, if present).
+    Uses the `.parquet` sibling written by resample_to_hourly.py instead when it
+    is at least as new as the CSV and pyarrow is installed.
+    """
+    cached = parquet_sibling(path)
+    if pa is not None and os.path.exists(cached) and os.path.getmtime(cached) >= os.path.getmtime(path):
+        df = pd.read_parquet(cached)
+        return df[[c for c in df.columns if c in columns]]
+    return pd.read_csv(
+        path,
+        usecols=lambda c: c.strip() in columns,
+        dtype={'timestamp': 'int64', 'symbol': str, 'close': 'float64'},
+    )
+
+def read_prices_csv(path: str) -> PriceMatrix:
     """
     Reads a long-format CSV with required columns: timestamp,symbol,close
     Optional funding columns supported (choose one):
       - funding_bps: per-period funding in basis points (bps)
       - funding, fundingRate: decimal fraction (e.g., 0.0001 for 1 bps)
 
-    Returns list of (timestamp, symbol, close, funding_bps)
+    Returns a PriceMatrix pivoted to wide [timestamp x symbol] matrices.
+    A fresh `.parquet` sibling is read instead of the CSV (see load_prices_frame).
     """
-    out: List[Tuple[int, str, float, float]] = []
-    with open(path, 'r', newline='') as f:
-        r = csv.DictReader(f)
-        # detect columns
-        cols = [c.strip() for c in r.fieldnames or []]
-        has_bps = 'funding_bps' in cols or 'funding_rate_bps' in cols
-        has_decimal = ('funding' in cols) or ('fundingRate' in cols)
-        for row in r:
-            ts = int(row['timestamp'])
-            sym = row['symbol']
-            close = float(row['close'])
-            f_bps = 0.0
-            if has_bps:
-                val = row.get('funding_bps') or row.get('funding_rate_bps')
-                if val not in (None, ''):
-                    try:
-                        f_bps = float(val)
-                    except Exception:
-                        f_bps = 0.0
-            elif has_decimal:
-                val = row.get('funding')
-                if val in (None, ''):
-                    val = row.get('fundingRate')
-                if val not in (None, ''):
-                    try:
-                        f_bps = float(val) * 10000.0
-                    except Exception:
-                        f_bps = 0.0
-            out.append((ts, sym, close, f_bps))
-    out.sort(key=lambda x: x[0])
-    return out
+    funding_cols = ('funding_bps', 'funding_rate_bps', 'funding', 'fundingRate')
+    df = load_prices_frame(path, ('timestamp', 'symbol', 'close') + funding_cols)
+    df.columns = df.columns.str.strip()
+    cols = set(df.columns)
+
+    def num(col: str) -> pd.Series:
+        # blank / unparseable cells -> NaN
+        if col not in cols:
+            return pd.Series(np.nan, index=df.index)
+        return pd.to_numeric(df[col], errors='coerce')
+
+    if 'funding_bps' in cols or 'funding_rate_bps' in cols:
+        f_bps = num('funding_bps').fillna(num('funding_rate_bps'))
+    elif 'funding' in cols or 'fundingRate' in cols:
+        f_bps = num('funding').fillna(num('fundingRate')) * 10000.0
+    else:
+        f_bps = pd.Series(0.0, index=df.index)
+    df['funding_bps'] = f_bps.fillna(0.0)
+
+    # last row wins for duplicate (timestamp, symbol) pairs
+    df = df.sort_values('timestamp', kind='stable').drop_duplicates(['timestamp', 'symbol'], keep='last')
+    px = df.pivot(index='timestamp', columns='symbol', values='close')
+    fund = df.pivot(index='timestamp', columns='symbol', values='funding_bps').fillna(0.0)
+    return PriceMatrix(
+        px.index.tolist(),
+        px.columns.tolist(),
+        px.to_numpy(dtype=np.float64),
+        fund.to_numpy(dtype=np.float64),
+    )
 
-def backtest(prices: List[Tuple[int, str, float, float]], strat: Dict, cfg: Config, start_nav_usd: float = 1_000_000.0):
-    # state
-    symbols = sorted(set(sym for _, sym, _, _ in prices))
-    last_px: Dict[str,float] = {}
-    pos: Dict[str,int] = {s:0 for s in symbols} # USD 1e6
+def price_matrix(prices: List[Tuple[int, str, float, float]]) -> PriceMatrix:
+    # AoS (timestamp, symbol, close, funding_bps) rows -> PriceMatrix
+    if not prices:
+        return PriceMatrix([], [], np.empty((0, 0)), np.empty((0, 0)))
+    ts, sym, close, f_bps = (np.asarray(col) for col in zip(*prices))
+    timeline, t_idx = np.unique(ts.astype(np.int64), return_inverse=True)
+    symbols, s_idx = np.unique(sym, return_inverse=True)
+    px = np.full((len(timeline), len(symbols)), np.nan)
+    fund = np.zeros((len(timeline), len(symbols)))
+    px[t_idx, s_idx] = close
+    nz = f_bps != 0
+    fund[t_idx[nz], s_idx[nz]] = f_bps[nz]
+    return PriceMatrix(timeline.tolist(), symbols.tolist(), px, fund)
+
+def write_equity_curve(path_base: str, timeline: List[int], nav_arr: np.ndarray, gross_arr: np.ndarray, fee_arr: np.ndarray, fund_arr: np.ndarray, note_arr: np.ndarray, ec_format: str = EC_FORMAT) -> str:
+    """
+    Writes the per-step equity curve in one call and returns the file path.
+    'parquet' (zstd, needs pyarrow) stores fee/funding as float USD; 'csv' keeps the
+    original text layout with 2-decimal fee/funding columns.
+    """
+    names = ['timestamp','nav','gross_turnover_e6','fee_usd','funding_usd','note']
+    if ec_format == 'parquet':
+        if pa is None:
+            raise RuntimeError('parquet equity curve requires pyarrow; use ec_format="csv"')
+        path = path_base + '.parquet'
+        table = pa.Table.from_arrays([
+            pa.array(np.asarray(timeline, dtype=np.int64)), pa.array(nav_arr), pa.array(gross_arr),
+            pa.array(fee_arr / E6), pa.array(fund_arr / E6), pa.array(note_arr, type=pa.string()),
+        ], names=names)
+        pq.write_table(table, path, compression='zstd')
+        return path
+    if ec_format != 'csv':
+        raise ValueError(f'unknown equity curve format: {ec_format}')
+    path = path_base + '.csv'
+    with open(path, 'w', newline='') as f:
+        w = csv.writer(f)
+        w.writerow(names)
+        w.writerows(zip(timeline, nav_arr.tolist(), gross_arr.tolist(),
+                        [f"{v / E6:.2f}" for v in fee_arr.tolist()],
+                        [f"{v / E6:.2f}" for v in fund_arr.tolist()], note_arr.tolist()))
+    return path
+
+def backtest(prices: PriceMatrix | List[Tuple[int, str, float, float]], strat: Dict, cfg: Config, start_nav_usd: float = 1_000_000.0, reports_dir: str | None = REPORTS_DIR, ec_format: str = EC_FORMAT):
+    # reports_dir=None skips equity_curve / metrics.json (e.g. sweep workers)
+    if not isinstance(prices, PriceMatrix):
+        prices = price_matrix(prices)
+    timeline = prices.timeline
+    px_matrix = prices.px
+    fund_matrix = prices.fund
+
+    # symbol universe: priced symbols first, then strategy-only symbols (never priced, still traded)
+    symbols = list(prices.symbols)
+    strat_syms = [x['symbol'] for x in strat.get('longs', []) + strat.get('shorts', [])] + list(strat.get('symbols') or [])
+    for s in strat_syms:
+        if s not in symbols:
+            symbols.append(s)
+    sym_idx = {s:i for i,s in enumerate(symbols)}
+    N = len(symbols)
+    if N > px_matrix.shape[1]:
+        pad = N - px_matrix.shape[1]
+        px_matrix = np.hstack([px_matrix, np.full((len(timeline), pad), np.nan)])
+        fund_matrix = np.hstack([fund_matrix, np.zeros((len(timeline), pad))])
+
+    is_pair = strat.get('type') == 'pair_neutral_breakout'
+    params = pair_params(strat.get('params', {}))
+    pair_syms = (strat.get('symbols') or symbols)[:2]
+    # columns the strategy can hold; positions elsewhere stay 0, so only these are simulated
+    if is_pair:
+        cols = [sym_idx[s] for s in pair_syms] if len(pair_syms) >= 2 else []
+    else:
+        cols = sorted({sym_idx[x['symbol']] for x in strat['longs'] + strat['shorts']})
+    col_idx = {symbols[i]: j for j, i in enumerate(cols)}
+    weights = None if is_pair else bucket_weights(strat, col_idx)
+    cap = symbol_caps([symbols[i] for i in cols], cfg)
+    buf = guard_buffers(len(cols))
+
+    # per-step returns and last prices for those columns, computed once across the timeline
+    # (last price = forward-filled close; a return needs a price now and one before)
+    px_cols = px_matrix[:, cols]
+    last_cols = pd.DataFrame(px_cols).ffill().to_numpy()
+    prev_cols = np.roll(last_cols, 1, axis=0)
+    prev_cols[:1] = np.nan
+    has_ret = ~np.isnan(px_cols) & ~np.isnan(prev_cols)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ret_rows = np.where(has_ret, px_cols / prev_cols - 1.0, 0.0).tolist()
+    fund_cols = fund_matrix[:, cols]
+    fund_rows = fund_cols.tolist()
+    has_funding = fund_cols.any(axis=1).tolist()
+
+    # state over `cols` (plain ints / floats: the strategy trades only a few symbols)
+    k = len(cols)
+    pos = [0] * k # USD 1e6
     nav = int(start_nav_usd * E6)
     last_rebal_ts = None
-    fee_bps = cfg.__dict__.get('feeBps', 5.0)
-    slip_bps = cfg.__dict__.get('slipBps', 10.0)
-
-    rows_by_ts: Dict[int, Dict[str, float]] = defaultdict(dict)
-    funding_bps_by_ts: Dict[int, Dict[str, float]] = defaultdict(dict)
-    for ts, sym, px, f_bps in prices:
-        rows_by_ts[ts][sym] = px
-        if f_bps != 0:
-            funding_bps_by_ts[ts][sym] = f_bps
-    timeline = sorted(rows_by_ts.keys())
-
-    reports_dir = os.path.join(os.path.dirname(__file__), 'reports')
-    os.makedirs(reports_dir, exist_ok=True)
-    ec_path = os.path.join(reports_dir, 'equity_curve.csv')
-    # return histories for pair strategies
-    ret_hist: Dict[str, List[float]] = {s: [] for s in symbols}
-    spread_hist: Dict[Tuple[str,str], List[float]] = {}
+    # loop invariants
+    cooldown = cfg.cooldownSeconds
+    # skip gates in cross-multiplied form: for nav > 0, (g*1e4)//nav < t  <=>  g*1e4 < ceil(t)*nav
+    thr_bps = _math.ceil(cfg.rebalanceThresholdBps)
+    costs_e6 = round((cfg.feeBps + cfg.slipBps) * E6)  # fee + slippage, in 1e-6 bps
+
+    if reports_dir is not None:
+        os.makedirs(reports_dir, exist_ok=True)
+    # pair strategy state; return histories (only consumed by the beta hedge) capped at the lookback
+    neutral_thr_bps = _math.ceil(params.neutral_skip_bps)
+    track_rets = is_pair and params.use_beta and k > 0
+    if is_pair and k:
+        has_ret_rows = has_ret.tolist()
+        last_rows = last_cols.tolist()
+    ret_window = params.lookback
+    ret_hist: Dict[str, deque] = {s: deque(maxlen=ret_window if ret_window > 0 else None) for s in pair_syms}
+    spread_hist: Dict[Tuple[str,str], RollingStats] = {}
     pair_state: Dict = {'regime': 'neutral', 'hold': 0}
 
-    with open(ec_path, 'w', newline='') as f_ec:
-        w = csv.writer(f_ec)
-        w.writerow(['timestamp','nav','gross_turnover_e6','fee_usd','funding_usd','note'])
-
-        # for metrics
-        nav_series: List[float] = []
-        ts_series: List[int] = []
-        total_fee_usd = 0.0
-        total_funding_usd = 0.0
-        total_gross_turnover_e6 = 0
-        rebalances = 0
-        rebalances_with_trades = 0
-
-        for ts in timeline:
-            row = rows_by_ts[ts]
-            # 1) apply returns
-            pnl = 0
-            for s in symbols:
-                if s in row and s in last_px:
-                    ret = (row[s] / last_px[s]) - 1.0
-                    pnl += int(pos.get(s,0) * ret)
-                    ret_hist[s].append(ret)
-            nav += pnl
-
-            # update last prices
-            for s in row:
-                last_px[s] = row[s]
-
-            note = ''
+    # for metrics
+    # one NAV sample per timeline step (every branch below records exactly one)
+    nav_arr = np.empty(len(timeline), dtype=np.float64)
+    # equity-curve columns, filled in place and written once after the loop
+    gross_arr = np.zeros(len(timeline), dtype=np.int64)
+    fee_arr = np.zeros(len(timeline), dtype=np.int64)
+    fund_arr = np.zeros(len(timeline), dtype=np.int64)
+    note_arr = np.full(len(timeline), '', dtype=object)
+    total_fee_e6 = 0
+    total_funding_e6 = 0
+    total_gross_turnover_e6 = 0
+    rebalances = 0
+    rebalances_with_trades = 0
+
+    for t, ts in enumerate(timeline):
+        # 1) apply returns
+        r = ret_rows[t]
+        for j in range(k):
+            if pos[j]:
+                nav += int(pos[j] * r[j])
+        if track_rets:
+            hr = has_ret_rows[t]
+            for j in range(k):
+                if hr[j]:
+                    ret_hist[pair_syms[j]].append(r[j])
+
+        # 1.5) apply funding for the just-finished interval
+        # Positive funding_bps means longs pay shorts.
+        if has_funding[t]:
+            f = fund_rows[t]
+            funding_e6 = int(-sum(pos[j] * f[j] for j in range(k)) / 10000.0)
+            nav += funding_e6
+            fund_arr[t] = funding_e6
+            total_funding_e6 += funding_e6
+
+        # 2) periodic rebalance based on cooldownSeconds
+        if last_rebal_ts is None or (ts - last_rebal_ts) >= cooldown:
+            # targets and guards
+            meta_info = {}
+            active = ()
+            if is_pair:
+                if k >= 2:
+                    symA, symB = pair_syms
+                    last_px_d = {s: v for s, v in zip(pair_syms, last_rows[t]) if v == v}
+                    raw_targets, meta_info = compute_targets_pair_breakout(nav, last_px_d, ret_hist, symA, symB, params, cfg, pair_state, spread_hist)
+                    targets, active = buf.targets, buf.active
+                    active.clear()
+                    for s, v in raw_targets.items():
+                        targets[col_idx[s]] = v
+                        active.append(col_idx[s])
+                    targets, final = apply_guards(nav, pos, targets, active, cap, cfg, buf)
+            else:
+                active = weights[2]
+                targets, final = guard_and_targets(nav, pos, weights, cap, cfg, buf)
             gross_e6 = 0
-            fee_usd = 0.0
-            funding_usd = 0.0
-
-            # 1.5) apply funding for the just-finished interval
-            # Positive funding_bps means longs pay shorts.
-            if ts in funding_bps_by_ts:
-                for s, f_bps in funding_bps_by_ts[ts].items():
-                    p = pos.get(s, 0)
-                    if p != 0 and f_bps != 0:
-                        funding_usd += -(p / E6) * (f_bps / 10000.0)
-                nav += int(funding_usd * E6)
-                total_funding_usd += funding_usd
-
-            # 2) periodic rebalance based on cooldownSeconds
-            if last_rebal_ts is None or (ts - last_rebal_ts) >= cfg.cooldownSeconds:
-                # targets and guards
-                meta_info = {}
-                if strat.get('type') == 'pair_neutral_breakout':
-                    syms = strat.get('symbols') or symbols
-                    if len(syms) < 2:
-                        targets = {}
-                    else:
-                        symA, symB = syms[0], syms[1]
-                        params = strat.get('params', {})
-                        raw_targets, meta_info = compute_targets_pair_breakout(nav, last_px, ret_hist, symA, symB, params, cfg, pair_state, spread_hist)
-                        targets, final = apply_guards(nav, pos, raw_targets, cfg)
-                else:
-                    targets, final = guard_and_targets(nav, pos, strat, cfg)
-                deltas = {s: final.get(s,0) - pos.get(s,0) for s in final.keys()}
-                gross_e6 = sum(abs(v) for v in deltas.values())
-
-                # extra neutral drift threshold for pair strategy
-                if meta_info.get('regime') == 'neutral' and nav > 0:
-                    nbps = float(meta_info.get('neutralSkipBps') or 0.0)
-                    if nbps > 0:
-                        gross_bps_neutral = (gross_e6 * 10000) // max(nav, 1)
-                        if gross_bps_neutral < nbps:
-                            note = 'skip_neutral_drift'
-                            w.writerow([ts, nav / E6, gross_e6, f"{fee_usd:.2f}", f"{funding_usd:.2f}", note])
-                            nav_series.append(nav / E6)
-                            ts_series.append(ts)
-                            continue
-
-                # optional threshold: skip tiny rebalances (reduce fee churn)
-                if cfg.rebalanceThresholdBps > 0 and nav > 0:
-                    gross_bps = (gross_e6 * 10000) // max(nav, 1)
-                    if gross_bps < cfg.rebalanceThresholdBps:
-                        # do not update positions or last_rebal_ts; just mark note and continue
-                        note = 'skip_threshold'
-                        w.writerow([ts, nav / E6, gross_e6, f"{fee_usd:.2f}", f"{funding_usd:.2f}", note])
-                        nav_series.append(nav / E6)
-                        ts_series.append(ts)
-                        continue
-
-                # fees/slippage on turnover
-                costs_bps = (fee_bps + slip_bps) / 10000.0
-                fee_usd = (gross_e6 / E6) * costs_bps
-
-                # apply fills
-                pos.update(final)
-                nav -= int(fee_usd * E6)
-                last_rebal_ts = ts
-                note = 'rebalance'
-                rebalances += 1
-                if gross_e6 > 0:
-                    rebalances_with_trades += 1
-                total_gross_turnover_e6 += gross_e6
-                total_fee_usd += fee_usd
-
-            w.writerow([ts, nav / E6, gross_e6, f"{fee_usd:.2f}", f"{funding_usd:.2f}", note])
-            nav_series.append(nav / E6)
-            ts_series.append(ts)
+            for j in active:
+                gross_e6 += abs(final[j] - pos[j])
+            gross_arr[t] = gross_e6
+
+            # extra neutral drift threshold for pair strategy
+            if neutral_thr_bps > 0 and nav > 0 and meta_info.get('regime') == 'neutral' and gross_e6 * 10000 < neutral_thr_bps * nav:
+                note_arr[t] = 'skip_neutral_drift'
+                nav_arr[t] = nav / E6
+                continue
+
+            # optional threshold: skip tiny rebalances (reduce fee churn)
+            if thr_bps > 0 and nav > 0 and gross_e6 * 10000 < thr_bps * nav:
+                # do not update positions or last_rebal_ts; just mark note and continue
+                note_arr[t] = 'skip_threshold'
+                nav_arr[t] = nav / E6
+                continue
+
+            # fees/slippage on turnover (exact integer USD 1e6)
+            fee_e6 = (gross_e6 * costs_e6) // (10000 * E6)
+
+            # apply fills
+            for j in active:
+                pos[j] = final[j]
+            nav -= fee_e6
+            last_rebal_ts = ts
+            fee_arr[t] = fee_e6
+            note_arr[t] = 'rebalance'
+            rebalances += 1
+            if gross_e6 > 0:
+                rebalances_with_trades += 1
+            total_gross_turnover_e6 += gross_e6
+            total_fee_e6 += fee_e6
+
+        nav_arr[t] = nav / E6
+    if reports_dir is not None:
+        write_equity_curve(os.path.join(reports_dir, 'equity_curve'), timeline, nav_arr, gross_arr, fee_arr, fund_arr, note_arr, ec_format)
 
     # summary metrics
-    def compute_metrics(nav_series: List[float], ts_series: List[int]):
+    def compute_metrics(nav_arr: np.ndarray, ts_arr: np.ndarray):
         res: Dict[str, float] = {}
-        if len(nav_series) < 2:
+        if len(nav_arr) < 2:
             return res
-        start_nav = nav_series[0]
-        end_nav = nav_series[-1]
+        start_nav = float(nav_arr[0])
+        end_nav = float(nav_arr[-1])
         total_return = (end_nav / start_nav) - 1.0 if start_nav > 0 else 0.0
-        duration_sec = max(1, ts_series[-1] - ts_series[0])
+        duration_sec = max(1, int(ts_arr[-1] - ts_arr[0]))
         year_sec = 365 * 24 * 3600
         cagr = (end_nav / start_nav) ** (year_sec / duration_sec) - 1.0 if start_nav > 0 else 0.0
         # step stats
-        step_rets: List[float] = []
-        for i in range(1, len(nav_series)):
-            prev = nav_series[i-1]
-            cur = nav_series[i]
-            if prev > 0:
-                step_rets.append((cur / prev) - 1.0)
+        prev = nav_arr[:-1]
+        ok = prev > 0
+        step_rets = nav_arr[1:][ok] / prev[ok] - 1.0
         # cadence -> steps per year
-        if len(ts_series) >= 2:
-            deltas = [ts_series[i]-ts_series[i-1] for i in range(1, len(ts_series)) if ts_series[i]>ts_series[i-1]]
-            if len(deltas) > 0:
-                avg_dt = sum(deltas) / len(deltas)
-            else:
-                avg_dt = 3600.0
-        else:
-            avg_dt = 3600.0
+        deltas = np.diff(ts_arr)
+        deltas = deltas[deltas > 0]
+        avg_dt = float(deltas.mean()) if len(deltas) > 0 else 3600.0
         steps_per_year = year_sec / max(1.0, avg_dt)
         # sharpe (rf=0)
-        import math as _math
         if len(step_rets) >= 2:
-            m = sum(step_rets) / len(step_rets)
-            var = sum((x - m) ** 2 for x in step_rets) / (len(step_rets) - 1)
-            std = _math.sqrt(max(var, 0.0))
+            m = float(step_rets.mean())
+            std = float(step_rets.std(ddof=1))
             sharpe = (m / std) * (_math.sqrt(steps_per_year)) if std > 0 else 0.0
         else:
             sharpe = 0.0
         # max drawdown
-        peak = nav_series[0]
-        mdd = 0.0
-        for v in nav_series:
-            if v > peak:
-                peak = v
-            dd = (v / peak) - 1.0
-            if dd < mdd:
-                mdd = dd
+        peak = np.maximum.accumulate(nav_arr)
+        mdd = min(0.0, float((nav_arr / peak - 1.0).min()))
         res.update({
             'start_nav_usd': start_nav,
             'final_nav_usd': end_nav,
@@ -461,22 +686,20 @@ def backtest(prices: List[Tuple[int, str, float, float]], strat: Dict, cfg: Conf
             'cagr': cagr,
             'sharpe': sharpe,
             'max_drawdown': mdd,
-            'steps': len(nav_series),
+            'steps': len(nav_arr),
             'duration_days': duration_sec / 86400.0,
             'rebalances': rebalances,
             'rebalances_with_trades': rebalances_with_trades,
             'total_turnover_usd': total_gross_turnover_e6 / E6,
-            'total_fee_paid_usd': total_fee_usd,
-            'total_funding_pnl_usd': total_funding_usd,
+            'total_fee_paid_usd': total_fee_e6 / E6,
+            'total_funding_pnl_usd': total_funding_e6 / E6,
         })
         return res
 
-    metrics = compute_metrics(nav_series, ts_series)
+    metrics = compute_metrics(nav_arr, np.asarray(timeline, dtype=np.int64))
     # Write metrics.json
-    reports_dir = os.path.join(os.path.dirname(__file__), 'reports')
-    os.makedirs(reports_dir, exist_ok=True)
-    with open(os.path.join(reports_dir, 'metrics.json'), 'w') as f_m:
-        json.dump(metrics, f_m, indent=2)
+    if reports_dir is not None:
+        _write_json(os.path.join(reports_dir, 'metrics.json'), metrics)
 
     # Return key results in stdout
     out = {'final_nav_usd': nav / E6}
@@ -485,11 +708,49 @@ def backtest(prices: List[Tuple[int, str, float, float]], strat: Dict, cfg: Conf
     )})
     return out
 
+# per-worker state for sweep(): PriceMatrix views onto the parent's shared-memory block
+_SWEEP: Dict = {}
+
+def _sweep_init(timeline: List[int], symbols: List[str], shm_name: str, shape: Tuple[int, int]) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    block = np.ndarray((2,) + shape, dtype=np.float64, buffer=shm.buf)
+    block.flags.writeable = False
+    _SWEEP['shm'] = shm  # keep the mapping alive for the worker's lifetime
+    _SWEEP['prices'] = PriceMatrix(timeline, symbols, block[0], block[1])
+
+def _sweep_one(args: Tuple[Dict, Config, float]) -> Dict:
+    strat, cfg, start_nav_usd = args
+    return backtest(_SWEEP['prices'], strat, cfg, start_nav_usd=start_nav_usd, reports_dir=None)
+
+def sweep(prices_path: str, strats: List[str | Dict], cfg: Config, start_nav_usd: float = 1_000_000.0, processes: int | None = None) -> List[Dict]:
+    """
+    Runs one independent backtest per strategy (path or loaded dict) in a process pool.
+
+    Prices are parsed once; the px/fund matrices are copied into a single
+    SharedMemory block that workers map read-only (zero-copy input). Workers
+    do not write reports. Returns the per-strategy backtest() results in order.
+    """
+    prices = read_prices_csv(prices_path)
+    trials = [(load_strategy(s) if isinstance(s, str) else s, cfg, start_nav_usd) for s in strats]
+    shape = prices.px.shape
+    shm = shared_memory.SharedMemory(create=True, size=max(1, 2 * prices.px.nbytes))
+    try:
+        block = np.ndarray((2,) + shape, dtype=np.float64, buffer=shm.buf)
+        block[0] = prices.px
+        block[1] = prices.fund
+        del block
+        with Pool(processes or os.cpu_count(), initializer=_sweep_init, initargs=(prices.timeline, prices.symbols, shm.name, shape)) as pool:
+            return pool.map(_sweep_one, trials)
+    finally:
+        shm.close()
+        shm.unlink()
+
 if __name__ == '__main__':
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument('--prices', type=str, required=True)
-    parser.add_argument('--strategy', type=str, required=True)
+    parser.add_argument('--strategy', type=str, nargs='+', required=True, help='Strategy JSON; pass several to sweep them in parallel (no report files)')
+    parser.add_argument('--processes', type=int, default=None, help='Worker processes for multi-strategy sweeps (default: CPU count)')
     parser.add_argument('--config', type=str, default=os.path.join(os.path.dirname(__file__), '..', 'bots', 'config.json'))
     parser.add_argument('--start_nav', type=float, default=1_000_000.0)
     parser.add_argument('--cooldown_seconds', type=int, default=None, help='Override cooldownSeconds for cadence (e.g., 1800 for 30m)')
@@ -497,6 +758,7 @@ if __name__ == '__main__':
     parser.add_argument('--slip_bps', type=float, default=None, help='Override slippage bps')
     parser.add_argument('--leverage', type=float, default=None, help='Gross leverage multiplier for long/short buckets (default 1.0 -> gross ~2x NAV)')
     parser.add_argument('--rebalance_threshold_bps', type=float, default=None, help='Skip rebalances if gross turnover < threshold (bps of NAV)')
+    parser.add_argument('--format', type=str, choices=['parquet', 'csv'], default=EC_FORMAT, help='Equity curve file format (default parquet when pyarrow is installed)')
     args = parser.parse_args()
 
     cfg = load_bots_config(args.config)
@@ -510,7 +772,11 @@ if __name__ == '__main__':
         cfg.leverage = args.leverage
     if args.rebalance_threshold_bps is not None:
         cfg.rebalanceThresholdBps = args.rebalance_threshold_bps
-    strat = load_strategy(args.strategy)
-    px = read_prices_csv(args.prices)
-    res = backtest(px, strat, cfg, start_nav_usd=args.start_nav)
-    print(json.dumps(res, indent=2))
+    if len(args.strategy) > 1:
+        results = sweep(args.prices, args.strategy, cfg, start_nav_usd=args.start_nav, processes=args.processes)
+        print(json.dumps(dict(zip(args.strategy, results)), indent=2))
+    else:
+        strat = load_strategy(args.strategy[0])
+        px = read_prices_csv(args.prices)
+        res = backtest(px, strat, cfg, start_nav_usd=args.start_nav, ec_format=args.format)
+        print(json.dumps(res, indent=2))
@@ -14,12 +14,72 @@ import csv
 import json
 import os
 import sys
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from typing import Dict, Tuple
 
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is used instead
+    orjson = None
 
-def fetch_candle_snapshot(base_url: str, coin: str, interval: str, req_type: str = 'candleSnapshot', coin_key: str = 'coin', interval_key: str = 'interval', start_ms: int | None = None, end_ms: int | None = None, n: int | None = None) -> List[Tuple[int, float]]:
+try:
+    import ijson
+except ImportError:  # ijson is optional; only needed for --stream
+    ijson = None
+
+# one keep-alive pool shared by the per-symbol fetch threads
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+
+# keys that may hold the candle array (top-level, or under 'details')
+_ROW_KEYS = ('data', 'result', 'candles', 'ohlcv', 'rows', 'value')
+_ROW_PREFIXES = {''} | set(_ROW_KEYS) | {'details.data'}
+
+
+def _stream_candle_rows(raw) -> list:
+    """
+    Incrementally parses a candle response from a file-like body and returns
+    the rows of the first candle array found, without holding the raw body or
+    the full JSON tree in memory. The rows themselves are still collected (the
+    caller sorts and de-duplicates them), so memory grows with the row count.
+    """
+    rows: list = []
+    item_prefix = None
+    builder = None
+    for prefix, event, value in ijson.parse(raw, use_float=True):
+        if item_prefix is None:
+            if event == 'start_array' and prefix in _ROW_PREFIXES:
+                item_prefix = f'{prefix}.item' if prefix else 'item'
+            elif prefix == '' and event == 'string':
+                # Top-level is a JSON string of an array
+                parsed = json.loads(value)
+                return parsed if isinstance(parsed, list) else []
+            continue
+        if builder is None:
+            if prefix != item_prefix:
+                break  # end of the candle array
+            if event in ('start_map', 'start_array'):
+                builder = ijson.ObjectBuilder()
+            else:
+                continue  # scalar item; not a candle row
+        builder.event(event, value)
+        if prefix == item_prefix and event in ('end_map', 'end_array'):
+            rows.append(builder.value)
+            builder = None
+    return rows
+
+
+def fetch_candle_snapshot(base_url: str, coin: str, interval: str, req_type: str = 'candleSnapshot', coin_key: str = 'coin', interval_key: str = 'interval', start_ms: int | None = None, end_ms: int | None = None, n: int | None = None, session: requests.Session = SESSION, stream: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns (ts int64[n] unix seconds, close float64[n]) sorted by time, one row per timestamp.
+    """
     url = base_url.rstrip('/')
     headers = {"content-type": "application/json"}
     # Prefer req-wrapped shape; many deployments expect this for candles
@@ -29,54 +89,69 @@ def fetch_candle_snapshot(base_url: str, coin: str, interval: str, req_type: str
     elif n is not None:
         req.update({"n": int(n)})
     payload = {"type": req_type, "req": req}
-    r = requests.post(url, headers=headers, data=json.dumps(payload), timeout=30)
+    if stream and ijson is None:
+        raise RuntimeError('stream=True requires ijson (pip install ijson)')
+    r = session.post(url, headers=headers, data=json.dumps(payload), timeout=30, stream=stream)
     r.raise_for_status()
-    # Expect JSON; try to parse flexible shapes, including stringified JSON
-    try:
-        j = r.json()
-    except Exception as e:
-        # Some deployments return text/plain but with JSON content; try r.text
-        try:
-            j = json.loads(r.text)
-        except Exception:
-            raise RuntimeError(f"Non-JSON response from {url}: {e}; body starts with: {r.text[:120]!r}")
-
-    # Common shapes: {'data': [[t,o,h,l,c,v], ...]} or {'data':[{'t':..,'c':..}, ...]} or top-level list
-    data = None
-    if isinstance(j, str):
-        # Top-level is a JSON string of an array
+    if stream:
+        # parse rows straight off the socket (no full body / JSON tree in memory)
+        with r:
+            r.raw.decode_content = True
+            data = _stream_candle_rows(r.raw)
+        if not data:
+            raise RuntimeError(f"No candle array found in streamed response from {url}")
+    else:
+        # Expect JSON; try to parse flexible shapes, including stringified JSON
         try:
-            parsed = json.loads(j)
-            if isinstance(parsed, list):
-                data = parsed
-        except Exception:
-            pass
-    if data is None and isinstance(j, dict):
-        # Some servers nest deeper; try typical keys
-        for key in ('data', 'result', 'candles', 'ohlcv', 'rows', 'value'):
-            if key in j and isinstance(j[key], list):
-                data = j[key]
-                break
-        if data is None and isinstance(j.get('details', {}).get('data'), list):
-            data = j['details']['data']
-    elif isinstance(j, list):
-        data = j
-
-    if not data:
-        # Last resort: dump keys to help user debug
-        raise RuntimeError(f"Unexpected response shape. Top-level keys: {list(j.keys()) if isinstance(j, dict) else type(j)}")
-
-    out: List[Tuple[int, float]] = []
+            j = orjson.loads(r.content) if orjson is not None else r.json()
+        except Exception as e:
+            # Some deployments return text/plain but with JSON content; try r.text
+            try:
+                j = json.loads(r.text)
+            except Exception:
+                raise RuntimeError(f"Non-JSON response from {url}: {e}; body starts with: {r.text[:120]!r}")
+
+        # Common shapes: {'data': [[t,o,h,l,c,v], ...]} or {'data':[{'t':..,'c':..}, ...]} or top-level list
+        data = None
+        if isinstance(j, str):
+            # Top-level is a JSON string of an array
+            try:
+                parsed = json.loads(j)
+                if isinstance(parsed, list):
+                    data = parsed
+            except Exception:
+                pass
+        if data is None and isinstance(j, dict):
+            # Some servers nest deeper; try typical keys
+            for key in ('data', 'result', 'candles', 'ohlcv', 'rows', 'value'):
+                if key in j and isinstance(j[key], list):
+                    data = j[key]
+                    break
+            if data is None and isinstance(j.get('details', {}).get('data'), list):
+                data = j['details']['data']
+        elif isinstance(j, list):
+            data = j
+
+        if not data:
+            # Last resort: dump keys to help user debug
+            raise RuntimeError(f"Unexpected response shape. Top-level keys: {list(j.keys()) if isinstance(j, dict) else type(j)}")
+
+    if isinstance(data[0], (list, tuple)):
+        # [t, o, h, l, c, v]: one pass per column; rows may be ragged (e.g. extra trailing fields)
+        ts = np.fromiter((int(row[0]) for row in data), dtype=np.int64, count=len(data))
+        close = np.fromiter((float(row[4]) for row in data), dtype=np.float64, count=len(data))
+        # convert ms->s if needed
+        ts = np.where(ts > 10**12, ts // 1000, ts)
+        # sort by time; a repeated timestamp keeps its last candle (latest update)
+        order = np.argsort(ts, kind='stable')
+        ts, close = ts[order], close[order]
+        keep = np.append(ts[1:] != ts[:-1], True)
+        return ts[keep], close[keep]
+
+    # ts -> close; a repeated timestamp keeps its last candle, as above
+    by_ts: Dict[int, float] = {}
     for row in data:
-        if isinstance(row, (list, tuple)):
-            # [t, o, h, l, c, v] (assume seconds)
-            ts = int(row[0])
-            # convert ms->s if needed
-            if ts > 10**12:
-                ts = ts // 1000
-            close = float(row[4])
-            out.append((ts, close))
-        elif isinstance(row, dict):
+        if isinstance(row, dict):
             tval = row.get('t') or row.get('timestamp') or row.get('ts')
             if tval is None:
                 continue
@@ -86,11 +161,14 @@ def fetch_candle_snapshot(base_url: str, coin: str, interval: str, req_type: str
             cval = row.get('c') or row.get('close')
             if cval is None:
                 continue
-            close = float(cval)
-            out.append((ts, close))
-    # Deduplicate/sort
-    out = sorted({(ts, close) for ts, close in out}, key=lambda x: x[0])
-    return out
+            by_ts[ts] = float(cval)
+    ts = np.fromiter(by_ts.keys(), dtype=np.int64, count=len(by_ts))
+    close = np.fromiter(by_ts.values(), dtype=np.float64, count=len(by_ts))
+    # responses are normally already in time order; only sort when they are not
+    if np.any(ts[1:] < ts[:-1]):
+        order = np.argsort(ts, kind='stable')
+        ts, close = ts[order], close[order]
+    return ts, close
 
 
 def main():
@@ -105,27 +183,32 @@ def main():
     ap.add_argument('--start_ms', type=int, default=None)
     ap.add_argument('--end_ms', type=int, default=None)
     ap.add_argument('--n', type=int, default=None)
+    ap.add_argument('--workers', type=int, default=8, help='Concurrent symbol fetches')
+    ap.add_argument('--stream', action='store_true', help='Stream-parse responses with ijson (avoids holding the raw JSON document; parsed rows are still kept in memory)')
     args = ap.parse_args()
 
     os.makedirs(os.path.dirname(args.out), exist_ok=True)
-    with open(args.out, 'w', newline='') as f:
-        csv.writer(f).writerow(['timestamp', 'symbol', 'close'])
 
-    for sym in [s.strip() for s in args.symbols.split(',') if s.strip()]:
-        try:
-            rows = fetch_candle_snapshot(
-                args.base_url, sym, args.interval,
-                req_type=args.type, coin_key=args.coin_key, interval_key=args.interval_key,
-                start_ms=args.start_ms, end_ms=args.end_ms, n=args.n
-            )
-        except Exception as e:
-            print(f"Failed to fetch {sym}: {e}", file=sys.stderr)
-            continue
-        with open(args.out, 'a', newline='') as f:
-            w = csv.writer(f)
-            for ts, close in rows:
-                w.writerow([ts, sym, close])
-        print(f"Wrote {len(rows)} rows for {sym}")
+    symbols = [s.strip() for s in args.symbols.split(',') if s.strip()]
+    with ThreadPoolExecutor(max_workers=max(1, min(args.workers, len(symbols)))) as ex:
+        futures = {sym: ex.submit(
+            fetch_candle_snapshot,
+            args.base_url, sym, args.interval,
+            req_type=args.type, coin_key=args.coin_key, interval_key=args.interval_key,
+            start_ms=args.start_ms, end_ms=args.end_ms, n=args.n, stream=args.stream
+        ) for sym in symbols}
+    # write from the main thread, in --symbols order, through one buffered handle
+    with open(args.out, 'w', newline='', buffering=1 << 20) as f:
+        w = csv.writer(f)
+        w.writerow(['timestamp', 'symbol', 'close'])
+        for sym, fut in futures.items():
+            try:
+                ts, close = fut.result()
+            except Exception as e:
+                print(f"Failed to fetch {sym}: {e}", file=sys.stderr)
+                continue
+            w.writerows(zip(ts.tolist(), repeat(sym), close.tolist()))
+            print(f"Wrote {len(ts)} rows for {sym}")
     print('CSV written to', args.out)
 
 
@@ -0,0 +1,39 @@
+"""
+Tiny on-disk cache for the endpoint discovery scripts.
+
+Successful (HTTP 200, JSON) probe responses are stored as one JSON file per
+request key under `.probe_cache/`, so re-running a discovery scan skips the
+network for combinations that were already answered. Entries expire after
+TTL_SECONDS; pass `--no-cache` to the scripts to bypass the cache entirely.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Optional, Tuple
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '.probe_cache')
+TTL_SECONDS = 3600
+
+def cache_key(*parts) -> str:
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+def get(key: str, ttl: int = TTL_SECONDS) -> Optional[Tuple[int, str, object]]:
+    path = os.path.join(CACHE_DIR, key + '.json')
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, 'r') as f:
+            status, ctype, body = json.load(f)
+        return status, ctype, body
+    except (OSError, ValueError):
+        return None
+
+def put(key: str, status: int, ctype: str, body: object) -> None:
+    # write-then-rename so concurrent probe threads never see a partial file
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump([status, ctype, body], f)
+    os.replace(tmp, os.path.join(CACHE_DIR, key + '.json'))
@@ -1,47 +1,64 @@
 import csv
 import os
 import argparse
-from collections import defaultdict
-
-
-def resample_to_hourly(in_csv: str, out_csv: str):
-    rows_by_sym_hour = defaultdict(dict)  # sym -> hour_ts -> (ts, close)
-    with open(in_csv, 'r', newline='') as f:
-        r = csv.DictReader(f)
-        for row in r:
-            ts = int(row['timestamp'])
-            sym = row['symbol']
-            close = float(row['close'])
-            hour_ts = (ts // 3600) * 3600
-            # keep the last record within the hour (closest to next hour)
-            prev = rows_by_sym_hour[sym].get(hour_ts)
-            if prev is None or ts >= prev[0]:
-                rows_by_sym_hour[sym][hour_ts] = (ts, close)
-
-    # flatten and sort by timestamp
-    out_rows = []
-    for sym, by_hour in rows_by_sym_hour.items():
-        for hour_ts, (ts, close) in by_hour.items():
-            out_rows.append((hour_ts, sym, close))
-    out_rows.sort(key=lambda x: (x[0], x[1]))
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (pandas' parquet engine)
+except ImportError:  # pyarrow is optional; only the CSV is written
+    pyarrow = None
+
+
+def _last_per_hour(df: pd.DataFrame) -> pd.DataFrame:
+    # keep the last record within the hour (closest to next hour); ties keep the later row
+    df = df.sort_values('timestamp', kind='stable')
+    return df.groupby(['symbol', 'hour'], sort=False).tail(1)
+
+
+def resample_to_hourly(in_csv: str, out_csv: str, chunksize: int | None = None, parquet: bool = True):
+    dtype = {'timestamp': 'int64', 'symbol': str, 'close': 'float64'}
+    cols = ['timestamp', 'symbol', 'close']
+    # round_trip: parse closes exactly as float() does, so they survive the CSV round trip unchanged
+    read = dict(usecols=cols, dtype=dtype, engine='c', float_precision='round_trip')
+    if chunksize:
+        # reduce each chunk to its per-hour last rows, then reduce the survivors again
+        parts = []
+        for chunk in pd.read_csv(in_csv, chunksize=chunksize, **read):
+            chunk['hour'] = (chunk['timestamp'] // 3600) * 3600
+            parts.append(_last_per_hour(chunk))
+        df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=cols + ['hour'])
+    else:
+        df = pd.read_csv(in_csv, **read)
+        df['hour'] = (df['timestamp'] // 3600) * 3600
+    out = _last_per_hour(df)
+
+    # sort by timestamp, then symbol
+    out = (out[['hour', 'symbol', 'close']]
+           .rename(columns={'hour': 'timestamp'})
+           .sort_values(['timestamp', 'symbol'], kind='stable'))
 
     os.makedirs(os.path.dirname(out_csv), exist_ok=True)
-    with open(out_csv, 'w', newline='') as f:
+    # csv.writer writes floats with repr(), like the original; DataFrame.to_csv rounds to ~16 digits
+    with open(out_csv, 'w', newline='', buffering=1 << 20) as f:
         w = csv.writer(f)
-        w.writerow(['timestamp', 'symbol', 'close'])
-        for ts, sym, close in out_rows:
-            w.writerow([ts, sym, close])
+        w.writerow(cols)
+        w.writerows(out.itertuples(index=False, name=None))
+    if parquet and pyarrow is not None:
+        # typed columnar copy, written after the CSV so engine.load_prices_frame sees it as fresh
+        out.to_parquet(os.path.splitext(out_csv)[0] + '.parquet', compression='zstd', index=False)
 
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument('--in', dest='in_csv', default=os.path.join(os.path.dirname(__file__), 'data', 'prices.csv'))
     ap.add_argument('--out', dest='out_csv', default=os.path.join(os.path.dirname(__file__), 'data', 'prices_1h.csv'))
+    ap.add_argument('--chunksize', type=int, default=None, help='Read the input in chunks of this many rows (bounded memory for huge CSVs)')
+    ap.add_argument('--no-parquet', dest='parquet', action='store_false', help='Skip the .parquet copy next to the output CSV')
     args = ap.parse_args()
-    resample_to_hourly(args.in_csv, args.out_csv)
+    resample_to_hourly(args.in_csv, args.out_csv, chunksize=args.chunksize, parquet=args.parquet)
     print('Wrote hourly CSV to', args.out_csv)
 
 
 if __name__ == '__main__':
     main()
-
@@ -1,27 +1,22 @@
 import json
-import math
 import os
-import random
 import time
-from typing import List, Tuple
+from typing import Sequence
 
-from engine import backtest, load_bots_config, load_strategy
+import numpy as np
 
-def gen_synth(hours: int = 240, symbols = ("BTC","ETH"), seed: int = 42) -> List[Tuple[int,str,float]]:
-    random.seed(seed)
+from engine import PriceMatrix, backtest, load_bots_config, load_strategy
+
+def gen_synth(hours: int = 240, symbols: Sequence[str] = ("BTC","ETH"), seed: int = 42) -> PriceMatrix:
+    rng = np.random.default_rng(seed)
     now = int(time.time())
     start = now - hours*3600
-    prices = {s: 1000.0 if s=="BTC" else 100.0 for s in symbols}
-    out = []
-    for h in range(hours):
-        ts = start + h*3600
-        for s in symbols:
-            # simple mean-reverting noise with different vol
-            vol = 0.02 if s=="BTC" else 0.025
-            r = random.gauss(0, vol)
-            prices[s] *= (1.0 + r)
-            out.append((ts, s, prices[s]))
-    return out
+    timeline = (start + np.arange(hours, dtype=np.int64) * 3600).tolist()
+    # gaussian step returns with different vol per symbol, compounded per column
+    vols = np.array([0.02 if s=="BTC" else 0.025 for s in symbols])
+    px0 = np.array([1000.0 if s=="BTC" else 100.0 for s in symbols])
+    px = px0 * np.cumprod(1.0 + rng.normal(0.0, 1.0, size=(hours, len(symbols))) * vols, axis=0)
+    return PriceMatrix(timeline, list(symbols), px, np.zeros_like(px))
 
 if __name__ == '__main__':
     import argparse
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# tests import the backtest scripts as top-level modules, like run_synth.py does
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -0,0 +1,42 @@
+import os
+
+import engine
+
+BOTS = os.path.join(os.path.dirname(__file__), '..', '..', 'bots')
+
+
+def test_guard_and_targets_large_nav_keeps_target_signs():
+    # $500M NAV at 3x: bucket * bps exceeds int64, which used to flip the leg signs
+    cfg = engine.load_bots_config(os.path.join(BOTS, 'config.json'))
+    cfg.leverage = 3.0
+    cfg.perSymbolMaxUSD = {'default': 10**12}
+    strat = engine.load_strategy(os.path.join(BOTS, 'strategy_btc_eth.json'))
+    symbols = ['BTC', 'ETH']
+    weights = engine.bucket_weights(strat, {s: i for i, s in enumerate(symbols)})
+    nav = 500_000_000 * engine.E6
+    current = [0] * len(symbols)
+
+    targets, _ = engine.guard_and_targets(nav, current, weights, engine.symbol_caps(symbols, cfg), cfg)
+
+    bucket = int(nav * cfg.leverage)
+    assert targets[0] > 0 and targets[1] < 0
+    assert targets[0] == bucket * 7000 // 10000 - bucket * 3000 // 10000
+    assert targets[1] == bucket * 3000 // 10000 - bucket * 7000 // 10000
+
+
+def test_pair_breakout_large_nav_skew_keeps_leg_signs():
+    # $500M NAV with the shipped maxSkewBps=300: the skew exceeds int64, which the jitted core used to wrap
+    cfg = engine.load_bots_config(os.path.join(BOTS, 'config.json'))
+    strat = engine.load_strategy(os.path.join(BOTS, 'strategy_pair_breakout_btc_eth.json'))
+    params = dict(strat['params'], lookback=48)
+    nav = 500_000_000 * engine.E6
+    state = {'regime': 'neutral', 'hold': 0}
+    spread_hist = {}
+    for _ in range(47):
+        engine.compute_targets_pair_breakout(nav, {'BTC': 100.0, 'ETH': 100.0}, {}, 'BTC', 'ETH', params, cfg, state, spread_hist)
+
+    # a breakout far past 2 * k_in saturates the skew at maxSkewBps of NAV
+    targets, meta = engine.compute_targets_pair_breakout(nav, {'BTC': 120.0, 'ETH': 100.0}, {}, 'BTC', 'ETH', params, cfg, state, spread_hist)
+
+    assert meta['regime'] == 'long'
+    assert targets == {'BTC': 7500500000000000000, 'ETH': 0}
@@ -0,0 +1,31 @@
+import json
+
+import fetch_hyperliquid_info
+
+
+class _Resp:
+    def __init__(self, body):
+        self.content = json.dumps(body).encode()
+        self.text = self.content.decode()
+
+    def raise_for_status(self):
+        pass
+
+
+class _Session:
+    def __init__(self, body):
+        self.body = body
+
+    def post(self, *args, **kwargs):
+        return _Resp(self.body)
+
+
+def test_fetch_candle_snapshot_ragged_rows():
+    rows = [
+        [1700003600000, 1, 1, 1, "101.5", 1, 12],  # extra trailing field
+        [1700000000000, 1, 1, 1, 100.0],            # no volume
+        [1700003600000, 1, 1, 1, 102.0, 1],         # later update of the same candle
+    ]
+    ts, close = fetch_hyperliquid_info.fetch_candle_snapshot('http://x', 'BTC', '1h', session=_Session({'data': rows}))
+    assert ts.tolist() == [1700000000, 1700003600]
+    assert close.tolist() == [100.0, 102.0]
@@ -0,0 +1,27 @@
+import csv
+
+import resample_to_hourly
+
+
+def test_resample_keeps_closes_exact(tmp_path):
+    # 17 significant digits: pandas' default parser and to_csv both round these
+    in_csv = tmp_path / 'prices.csv'
+    in_csv.write_text(
+        'timestamp,symbol,close\r\n'
+        '1700000000,BTC,1.0\r\n'
+        '1700001800,BTC,486.23108331500663\r\n'
+        '1700001800,ETH,0.30000000000000004\r\n'
+        '1700003700,BTC,123.45678901234567\r\n'
+    )
+    out_csv = tmp_path / 'out' / 'prices_1h.csv'
+
+    resample_to_hourly.resample_to_hourly(str(in_csv), str(out_csv), parquet=False)
+
+    with open(out_csv, newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows == [
+        ['timestamp', 'symbol', 'close'],
+        ['1699999200', 'BTC', '486.23108331500663'],
+        ['1699999200', 'ETH', '0.30000000000000004'],
+        ['1700002800', 'BTC', '123.45678901234567'],
+    ]